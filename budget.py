@@ -4,15 +4,21 @@ import sqlite3
 import ttkbootstrap as ttk
 from datetime import datetime
 import logging
-import secrets
+import random
 import re
+import threading
+import queue
+import atexit
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor, wait
 from contextlib import contextmanager
 from dataclasses import dataclass
-from tkinter import ttk
+from typing import NamedTuple, Optional
 
 #Esse arquivo é responsável pela parte do ORÇAMENTO.
 # Conteúdo do arquivo utils.py
-@dataclass
+@dataclass(frozen=True)
 class UIConfig:
     BACKGROUND_COLOR: str = "#FFFFFF"
     BUTTON_COLOR: str = "#4CAF50"
@@ -28,17 +34,39 @@ class UIConfig:
     HEADER_TEXT_COLOR: str = "#000000"
     ERROR_COLOR: str = "#FF0000"
 
+# Shared, immutable UI settings
+CONFIG = UIConfig()
+
+# Format of the date_added / date columns
+DATE_FORMAT = "%d/%m/%Y"
+
+
+def configure_dialog_styles(config: UIConfig) -> None:
+    """Register the named styles dialog widgets use instead of per-widget options.
+
+    Call once, after the theme is set.
+    """
+    style = ttk.Style()
+    style.configure(
+        "Dialog.TLabel",
+        font=("Helvetica", 10, "bold"),
+        foreground=config.TEXT_COLOR2,
+        background=config.BACKGROUND_COLOR
+    )
+    # Typed text uses TEXT_COLOR2: TEXT_COLOR is as light as the field
+    style.configure("Dialog.TEntry", fieldbackground=config.ENTRY_BACKGROUND, foreground=config.TEXT_COLOR2)
+
 class DataValidator:
     EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$')
+    PHONE_REGEX = re.compile(r'^\(?\d{2}\)?[\s-]?\d{4,5}-?\d{4}$')
 
     @staticmethod
     def validate_email(email: str) -> bool:
-        return bool(DataValidator.EMAIL_REGEX.match(email))
+        return _EMAIL_MATCH(email) is not None
 
     @staticmethod
     def validate_phone(phone: str) -> bool:
-        regex = r'^\(?\d{2}\)?[\s-]?\d{4,5}-?\d{4}$'
-        return bool(re.match(regex, phone))
+        return _PHONE_MATCH(phone) is not None
 
     @staticmethod
     def sanitize_input(data: str) -> str:
@@ -48,68 +76,406 @@ class DataValidator:
     def validate_input(data: str, max_length: int = 100) -> bool:
         return bool(data and len(data) <= max_length)
 
+# Bound match methods, so validation skips the class attribute lookups
+_EMAIL_MATCH = DataValidator.EMAIL_REGEX.match
+_PHONE_MATCH = DataValidator.PHONE_REGEX.match
+
+class BudgetRecord(NamedTuple):
+    """One budget list row, in _SQL_SELECT_BUDGETS column order"""
+    budget_id: str
+    client_name: Optional[str]
+    date: str
+    type: str
+    completion: str
+    deadline: str
+    service: str
+
+
 # Conteúdo do arquivo database.py
+# SQL kept as constants so the connection's statement cache always hits
+_SQL_INSERT_BUDGET = """
+    INSERT INTO budgets (budget_id, client_id, date, type, completion, deadline, service)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_CLIENT = """
+    INSERT INTO clients (client_id, name, email, phone, observation, date_added)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+# Columns shown in the budget Treeview, in display order
+_BUDGET_COLS = ("b.budget_id", "c.name", "b.date", "b.type", "b.completion", "b.deadline", "b.service")
+_SQL_SELECT_BUDGETS = f"""
+    SELECT {", ".join(_BUDGET_COLS)}
+    FROM budgets b LEFT JOIN clients c ON b.client_id = c.client_id
+"""
+_SQL_UPDATE_BUDGET = """
+    UPDATE budgets
+    SET client_id=?, type=?, completion=?, deadline=?, service=?
+    WHERE budget_id=?
+"""
+_SQL_DELETE_BUDGET = "DELETE FROM budgets WHERE budget_id=?"
+_SQL_SELECT_CLIENT_NAMES = "SELECT name, client_id FROM clients"
+
+_SQL_SCHEMA_V1 = """
+    CREATE TABLE IF NOT EXISTS clients (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        client_id TEXT,
+        name TEXT,
+        email TEXT,
+        phone TEXT,
+        observation TEXT,
+        date_added TEXT);
+
+    CREATE TABLE IF NOT EXISTS budgets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        budget_id TEXT,
+        client_id TEXT,
+        date TEXT,
+        type TEXT,
+        completion TEXT,
+        deadline TEXT,
+        service TEXT);
+
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE,
+        password TEXT);
+
+    -- Resolve clients by name and join budgets to their client
+    CREATE INDEX IF NOT EXISTS idx_clients_name ON clients(name);
+    CREATE INDEX IF NOT EXISTS idx_budgets_client_id ON budgets(client_id);
+"""
+
 class DatabaseManager:
+    SCHEMA_VERSION = 1
+    POLL_INTERVAL_MS = 50
+    WRITE_DELAY_MS = 100
+    PRAGMAS = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-64000",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA foreign_keys=ON",
+    )
+
     def __init__(self, db_path: str = "database.db"):
         self.db_path = db_path
+        self._conn = None
+        # UI callbacks may overlap, so access to the shared connection is serialized
+        self._lock = threading.RLock()
+        # Single worker so background queries run one at a time, in order
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+        # (sql, params, callback, errback) writes waiting to be committed
+        # together, and the widget running their timer; Tk thread only
+        self._pending_writes = []
+        self._flush_after_id = None
+        self._flush_widget = None
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the long-lived connection and apply the PRAGMAs once"""
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, cached_statements=256)
+        # journal_mode reports the mode actually in effect; WAL can be refused
+        # (e.g. on network filesystems), in which case SQLite keeps the old one
+        journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        if journal_mode.lower() != "wal":
+            logging.warning(f"WAL not enabled, SQLite is using journal_mode={journal_mode}")
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
 
     @contextmanager
     def get_connection(self):
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path, timeout=30)
-            yield conn
-        finally:
-            if conn:
-                conn.close()
+        """Yield the shared connection, opening it on first use.
+
+        The connection stays open (keeping SQLite's page cache warm) until
+        close() is called.
+        """
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def submit(self, widget, func, callback, errback):
+        """Run func() on the database worker thread.
+
+        Tk may only be used from the mainloop thread, so the future is polled
+        with widget.after and callback(result), or errback(exception), runs
+        there once func finishes.
+        """
+        # Queued writes go to the worker first, so func sees them
+        self.flush_writes()
+        future = self._executor.submit(func)
+
+        def poll():
+            if not future.done():
+                widget.after(self.POLL_INTERVAL_MS, poll)
+                return
+            try:
+                result = future.result()
+            except Exception as e:
+                errback(e)
+            else:
+                callback(result)
+
+        widget.after(self.POLL_INTERVAL_MS, poll)
+        return future
+
+    def submit_batches(self, widget, sql, params, on_batch, on_done, errback, batch_size=500):
+        """Stream the rows of a query from the worker thread in batches.
+
+        on_batch(rows) runs on the Tk thread for each batch of up to
+        batch_size rows, yielding to the event loop between batches, then
+        on_done() once the result set is exhausted (or errback(exception)).
+        """
+        # Queued writes go to the worker first, so the query sees them
+        self.flush_writes()
+        batches = queue.Queue()
+
+        def produce():
+            with self.get_connection() as conn:
+                cursor = conn.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    batches.put(rows)
+
+        future = self._executor.submit(produce)
+
+        def poll():
+            # Read done() first: once the producer has finished, an empty
+            # queue really means every batch was delivered
+            done = future.done()
+            try:
+                rows = batches.get_nowait()
+            except queue.Empty:
+                if not done:
+                    widget.after(self.POLL_INTERVAL_MS, poll)
+                    return
+                try:
+                    future.result()
+                except Exception as e:
+                    errback(e)
+                else:
+                    on_done()
+                return
+            on_batch(rows)
+            widget.after_idle(poll)
+
+        widget.after(self.POLL_INTERVAL_MS, poll)
+        return future
+
+    def queue_write(self, widget, sql, params, callback, errback):
+        """Queue a write to be committed together with the ones that follow it.
+
+        Writes queued less than WRITE_DELAY_MS apart are flushed on the worker
+        thread in a single transaction, and any later submit() or
+        submit_batches() flushes them first. Once that transaction is done,
+        callback() or errback(exception) runs on the Tk thread.
+        """
+        self._pending_writes.append((sql, params, callback, errback))
+        if self._flush_after_id is not None:
+            self._flush_widget.after_cancel(self._flush_after_id)
+        self._flush_widget = widget
+        self._flush_after_id = widget.after(self.WRITE_DELAY_MS, self.flush_writes)
+
+    def flush_writes(self):
+        """Send the queued writes to the worker now instead of waiting for the timer.
+
+        Returns the worker future for the batch, or None if nothing was queued.
+        """
+        if self._flush_after_id is not None:
+            self._flush_widget.after_cancel(self._flush_after_id)
+            self._flush_after_id = None
+        writes, self._pending_writes = self._pending_writes, []
+        if not writes:
+            return None
+
+        def on_done(_):
+            for _, _, callback, _ in writes:
+                callback()
+
+        def on_error(e):
+            # One report per distinct errback, not one per write
+            for errback in dict.fromkeys(write[3] for write in writes):
+                errback(e)
+
+        return self.submit(self._flush_widget, lambda: self._write_batch(writes), on_done, on_error)
+
+    def wait_for_writes(self):
+        """Flush the queued writes and block until the worker has committed them.
+
+        Writes made directly on the Tk thread call this first, so they cannot
+        commit ahead of an earlier queued write. A failed batch is still
+        reported through its errbacks.
+        """
+        future = self.flush_writes()
+        if future is not None:
+            wait([future])
+
+    def _write_batch(self, writes):
+        """Run queued writes in order in one transaction"""
+        # Consecutive writes of the same statement go through one executemany
+        self._execute_many_in_transaction(
+            (sql, [write[1] for write in group])
+            for sql, group in itertools.groupby(writes, key=lambda write: write[0])
+        )
+
+    def _execute_many_in_transaction(self, statements):
+        """executemany each (sql, rows) pair, in order, in a single transaction.
+
+        Every write path (bulk inserts, bulk updates, queued writes) goes
+        through here, so they all commit the same way.
+        """
+        with self.get_connection() as conn:
+            # Take the write lock up front so the batch cannot fail halfway on SQLITE_BUSY
+            conn.execute("BEGIN IMMEDIATE")
+            for sql, rows in statements:
+                conn.executemany(sql, rows)
+            conn.commit()
+
+    def close(self):
+        """Stop the worker thread and close the shared connection"""
+        # Outside the lock: a pending job may still need it to finish
+        self._executor.shutdown(wait=True)
+        # Writes still waiting for their flush timer are committed now
+        writes, self._pending_writes = self._pending_writes, []
+        if writes:
+            try:
+                self._write_batch(writes)
+            except Exception as e:
+                logging.error(f"Error writing pending changes on close: {e}")
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     def init_database(self):
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''CREATE TABLE IF NOT EXISTS clients (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                client_id TEXT,
-                name TEXT,
-                email TEXT,
-                phone TEXT,
-                observation TEXT,
-                date_added TEXT)''')
+            # PRAGMA user_version records the schema already in place, so an
+            # up-to-date database skips the migration work on startup
+            cursor.execute("PRAGMA user_version")
+            version = cursor.fetchone()[0]
+            if version < self.SCHEMA_VERSION:
+                logging.info(f"Migrating database schema from version {version} to {self.SCHEMA_VERSION}")
+                self.run_migrations(cursor, version)
+                cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            
+            conn.commit()
+
+    def run_migrations(self, cursor, version: int) -> None:
+        """Bring the schema from `version` up to SCHEMA_VERSION.
+
+        The work runs in a single transaction that init_database commits.
+        """
+        if version < 1:
+            # executescript commits any open transaction before it runs, so the
+            # script opens the migration transaction itself
+            cursor.executescript("BEGIN IMMEDIATE;" + _SQL_SCHEMA_V1)
             
-            # Check and add columns if they don't exist
+            # Databases created before client_id/date_added existed lack those
+            # columns; this only runs until user_version records version 1
             cursor.execute("PRAGMA table_info(clients)")
-            columns = [column[1] for column in cursor.fetchall()]
+            columns = {column[1] for column in cursor.fetchall()}
             
             if 'client_id' not in columns:
                 cursor.execute("ALTER TABLE clients ADD COLUMN client_id TEXT")
             if 'date_added' not in columns:
                 cursor.execute("ALTER TABLE clients ADD COLUMN date_added TEXT")
-            
-            # Create budgets table
-            cursor.execute('''CREATE TABLE IF NOT EXISTS budgets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                budget_id TEXT,
-                client_id TEXT,
-                date TEXT,
-                type TEXT,
-                completion TEXT,
-                deadline TEXT,
-                service TEXT)''')
-            
-            # Create users table
-            logging.info("Creating users table if not exists")
-            cursor.execute('''CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE,
-                password TEXT)''')
-            logging.info("Users table created or already exists")
-            
-            conn.commit()
+
+            # Unique indexes for the edit/delete lookups; older databases may
+            # hold duplicate ids, which get fresh ones first
+            self._dedupe_ids(cursor, "budgets", "budget_id", "ART")
+            self._dedupe_ids(cursor, "clients", "client_id", "AUT")
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_budgets_budget_id ON budgets(budget_id)")
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_clients_client_id ON clients(client_id)")
+
+    @staticmethod
+    def _dedupe_ids(cursor, table: str, column: str, prefix: str) -> None:
+        """Give a new id to every row that repeats an id already in use"""
+        cursor.execute(f"""
+            SELECT id FROM {table}
+            WHERE {column} IS NOT NULL AND id NOT IN (
+                SELECT MIN(id) FROM {table} WHERE {column} IS NOT NULL GROUP BY {column}
+            )
+        """)
+        duplicates = [row[0] for row in cursor.fetchall()]
+        if not duplicates:
+            return
+
+        cursor.execute(f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL")
+        taken = {row[0] for row in cursor.fetchall()}
+        for row_id in duplicates:
+            new_id = f"{prefix}-{random.randrange(1000, 10000)}"
+            while new_id in taken:
+                new_id = f"{prefix}-{random.randrange(1000, 10000)}"
+            taken.add(new_id)
+            cursor.execute(f"UPDATE {table} SET {column}=? WHERE id=?", (new_id, row_id))
+        logging.warning(f"Reassigned {len(duplicates)} duplicate {column} values in {table}")
+
+    def bulk_insert_budgets(self, rows):
+        """Insert budget rows in a single transaction.
+
+        Each row is (budget_id, client_id, date, type, completion, deadline, service).
+        """
+        self.wait_for_writes()
+        self._execute_many_in_transaction([(_SQL_INSERT_BUDGET, rows)])
+
+    def bulk_update_budgets(self, rows):
+        """Update budget rows in a single transaction.
+
+        Each row is (client_id, type, completion, deadline, service, budget_id).
+        """
+        self.wait_for_writes()
+        self._execute_many_in_transaction([(_SQL_UPDATE_BUDGET, rows)])
+
+    def bulk_insert_clients(self, rows):
+        """Insert client rows in a single transaction.
+
+        Each row is (client_id, name, email, phone, observation, date_added).
+        """
+        self.wait_for_writes()
+        self._execute_many_in_transaction([(_SQL_INSERT_CLIENT, rows)])
 
 # Classe BudgetManager
 class BudgetManager:
+    ID_ATTEMPTS = 5
+    FILTER_DELAY_MS = 120
+    INSERT_CHUNK_SIZE = 200
+    # (label, bootstyle, method name) for the budget tab buttons
+    BUDGET_BUTTON_SPECS = (
+        ("Adicionar", "success-outline", "open_add_budget_dialog"),
+        ("Editar", "warning-outline", "open_edit_budget_dialog"),
+        ("Excluir", "danger-outline", "delete_budget_record"),
+        ("Recarregar", "info-outline", "load_budget_data"),
+    )
+    # (label, BudgetRecord field) for the edit budget dialog, in display order
+    BUDGET_EDIT_FIELDS = (
+        ("Nome do Cliente:", "client_name"),
+        ("Tipo:", "type"),
+        ("Previsão de Conclusão:", "completion"),
+        ("Prazo:", "deadline"),
+        ("Serviço:", "service"),
+    )
+
     def __init__(self, db_manager, config):
         self.db_manager = db_manager
         self.config = config
+        self._client_names = []
+        self._client_names_casefold = []
+        self._filter_after_id = None
+        self._load_generation = 0
+        # Tree iid (the budget_id) -> BudgetRecord for every row in the budget
+        # tree, so the dialogs read typed values instead of round-tripping through Tcl
+        self._budgets_by_id = {}
+        self._stand_in_ids = itertools.count()
+        # Built on first edit and reused afterwards
+        self._edit_budget_dialog = None
 
     def init_budget_ui(self, notebook):
         self.budget_frame = ttk.Frame(notebook)
@@ -130,6 +496,7 @@ class BudgetManager:
             columns=("ID", "Nome do Cliente", "Data", "Tipo", "Previsão de Conclusão", "Prazo", "Serviço"),
             show="headings"
         )
+        assert len(self.budget_tree["columns"]) == len(_BUDGET_COLS), "budget columns out of sync with the query"
         
         # Configure headings
         budget_headings = {
@@ -147,9 +514,9 @@ class BudgetManager:
             self.budget_tree.column(col, width=props["width"], anchor=props["anchor"])
 
         # Scrollbar
-        budget_scrollbar = ttk.Scrollbar(self.budget_frame, orient=tk.VERTICAL, command=self.budget_tree.yview)
-        self.budget_tree.configure(yscroll=budget_scrollbar.set)
-        budget_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.budget_scrollbar = ttk.Scrollbar(self.budget_frame, orient=tk.VERTICAL, command=self.budget_tree.yview)
+        self.budget_tree.configure(yscroll=self.budget_scrollbar.set)
+        self.budget_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.budget_tree.pack(fill=tk.BOTH, expand=True)
 
         # Buttons frame
@@ -157,18 +524,11 @@ class BudgetManager:
         budget_button_frame.pack(fill=tk.X, pady=10)
 
         # Buttons
-        budget_buttons = [
-            ("Adicionar", "success-outline", self.open_add_budget_dialog),
-            ("Editar", "warning-outline", self.open_edit_budget_dialog),
-            ("Excluir", "danger-outline", self.delete_budget_record),
-            ("Recarregar", "info-outline", self.load_budget_data)
-        ]
-
-        for text, style, command in budget_buttons:
+        for text, style, method_name in self.BUDGET_BUTTON_SPECS:
             btn = ttk.Button(
                 budget_button_frame,
                 text=text,
-                command=command,
+                command=getattr(self, method_name),
                 bootstyle=style
             )
             btn.pack(side=tk.LEFT, padx=5, pady=2)
@@ -186,53 +546,61 @@ class BudgetManager:
         }
 
         entry_widgets = {}
+        client_ids = {}
         for label_text, placeholder in entries.items():
-            ttk.Label(
-                dialog,
-                text=label_text,
-                font=("Helvetica", 10, "bold"),
-                foreground=self.config.TEXT_COLOR2,
-                background=self.config.BACKGROUND_COLOR
-            ).pack(pady=5)
+            ttk.Label(dialog, text=label_text, style="Dialog.TLabel").pack(pady=5)
             
             if label_text == "Nome do Cliente:":
                 entry = ttk.Combobox(dialog)
                 entry.pack(pady=5)
-                entry.configure(background=self.config.ENTRY_BACKGROUND)
-                self.populate_client_names(entry)
-                entry.bind("<KeyRelease>", lambda event: self.filter_client_names(entry))
+                client_ids = self.populate_client_names(entry)
+                if client_ids is None:
+                    dialog.destroy()
+                    return
+                entry.bind("<KeyRelease>", lambda event, entry=entry: self._schedule_filter(entry))
             else:
-                entry = ttk.Entry(dialog)
+                entry = ttk.Entry(dialog, style="Dialog.TEntry")
                 entry.pack(pady=5)
-                entry.configure(background=self.config.ENTRY_BACKGROUND)
                 self.add_placeholder(entry, placeholder)
             
             entry_widgets[label_text] = entry
 
+        name_entry, type_entry, completion_entry, deadline_entry, service_entry = entry_widgets.values()
+
         def save_budget():
-            client_name = entry_widgets["Nome do Cliente:"].get()
-            budget_type = entry_widgets["Tipo:"].get()
-            completion = entry_widgets["Previsão de Conclusão:"].get()
-            deadline = entry_widgets["Prazo:"].get()
-            service = entry_widgets["Serviço:"].get()
+            client_name = name_entry.get()
+            budget_type = type_entry.get()
+            completion = completion_entry.get()
+            deadline = deadline_entry.get()
+            service = service_entry.get()
 
             if client_name == "Digite o nome do cliente" or not client_name:
                 messagebox.showwarning("Aviso", "O campo Nome do Cliente é obrigatório!")
-                entry_widgets["Nome do Cliente:"].config(bootstyle="danger")
+                name_entry.config(bootstyle="danger")
+                return
+
+            client_id = self._resolve_client_id(client_ids, name_entry)
+            if client_id is None:
                 return
 
-            budget_id = self.generate_budget_id()
-            date_added = datetime.now().strftime("%d/%m/%Y")
+            date_added = datetime.now().strftime(DATE_FORMAT)
 
             try:
-                with self.db_manager.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        INSERT INTO budgets (budget_id, client_id, date, type, completion, deadline, service)
-                        VALUES (?, (SELECT client_id FROM clients WHERE name=?), ?, ?, ?, ?, ?)
-                    """, (budget_id, client_name, date_added, budget_type, completion, deadline, service))
-                    conn.commit()
-                self.load_budget_data()
+                # budget_id is unique; try the next distinct candidate if it is already taken
+                for attempt, budget_id in enumerate(self.generate_budget_ids(self.ID_ATTEMPTS)):
+                    try:
+                        self.db_manager.bulk_insert_budgets(
+                            [(budget_id, client_id, date_added, budget_type, completion, deadline, service)]
+                        )
+                        break
+                    except sqlite3.IntegrityError:
+                        if attempt == self.ID_ATTEMPTS - 1:
+                            raise
+                # Show the new row directly instead of reloading the list
+                self._show_budget(
+                    budget_id,
+                    BudgetRecord(budget_id, client_name, date_added, budget_type, completion, deadline, service)
+                )
                 messagebox.showinfo("Sucesso", "Orçamento adicionado com sucesso!")
                 dialog.destroy()
             except Exception as e:
@@ -257,23 +625,78 @@ class BudgetManager:
             bootstyle="danger-outline"
         ).pack(side=tk.RIGHT, padx=5)
 
-    def populate_client_names(self, combobox):
-        """Populate the combobox with client names from the database"""
+        # Built while withdrawn (see create_dialog); show it in one layout pass
+        dialog.deiconify()
+
+    def populate_client_names(self, combobox) -> Optional[dict]:
+        """Populate the combobox with client names from the database.
+
+        Returns the {name: client_id} map so the dialog can resolve the chosen
+        client on save without another query, or None if it could not be read.
+        """
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT name FROM clients")
-                client_names = [row[0] for row in cursor.fetchall()]
-                combobox['values'] = client_names
+                cursor.execute(_SQL_SELECT_CLIENT_NAMES)
+                # clients.name is nullable; unnamed clients cannot be chosen
+                client_ids = dict(row for row in cursor.fetchall() if row[0] is not None)
+            self._client_names = list(client_ids)
+            self._client_names_casefold = [name.casefold() for name in self._client_names]
+            self._set_combobox_names(combobox, tuple(self._client_names))
         except Exception as e:
             logging.error(f"Error loading client names: {e}")
             messagebox.showerror("Erro", f"Erro ao carregar nomes de clientes: {e}")
+            return None
+
+        return client_ids
+
+    def _resolve_client_id(self, client_ids: dict, combobox) -> Optional[str]:
+        """Return the id of the client named in the combobox, or None if unknown.
+
+        A name missing from the map read when the dialog opened is looked up
+        again, so clients registered since then are still found.
+        """
+        client_name = combobox.get()
+        if client_name not in client_ids:
+            client_ids = self.populate_client_names(combobox)
+            if client_ids is None:
+                return None
+            if client_name not in client_ids:
+                messagebox.showwarning("Aviso", "Cliente não encontrado. Cadastre o cliente primeiro.")
+                combobox.config(bootstyle="danger")
+                return None
+        return client_ids[client_name]
+
+    def _set_combobox_names(self, combobox, names: tuple) -> None:
+        """Assign combobox values, skipping the Tcl list conversion if unchanged"""
+        # Kept on the widget so it goes away with the dialog that owns it
+        if getattr(combobox, "_shown_names", None) == names:
+            return
+        combobox._shown_names = names
+        combobox['values'] = names
+
+    def _schedule_filter(self, combobox):
+        """Debounce filter_client_names so a burst of keystrokes filters once"""
+        if self._filter_after_id is not None:
+            self.budget_frame.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.budget_frame.after(
+            self.FILTER_DELAY_MS, lambda: self._run_filter(combobox)
+        )
+
+    def _run_filter(self, combobox):
+        self._filter_after_id = None
+        if combobox.winfo_exists():
+            self.filter_client_names(combobox)
 
     def filter_client_names(self, combobox):
         """Filter the client names in the combobox based on user input"""
-        user_input = combobox.get().lower()
-        filtered_names = [name for name in combobox['values'] if user_input in name.lower()]
-        combobox['values'] = filtered_names
+        # Always filter the full list so deleting characters widens the results again
+        user_input = combobox.get().casefold()
+        filtered_names = tuple(
+            name for name, folded in zip(self._client_names, self._client_names_casefold)
+            if user_input in folded
+        )
+        self._set_combobox_names(combobox, filtered_names)
         combobox.event_generate('<Down>')
 
     def open_edit_budget_dialog(self):
@@ -282,131 +705,232 @@ class BudgetManager:
             messagebox.showwarning("Aviso", "Selecione um orçamento para editar.")
             return
 
-        item = self.budget_tree.item(selected_item)
-        budget_id = item['values'][0]
+        # Items are keyed by budget_id, so the selection alone finds the record
+        iid = selected_item[0]
+        budget = self._budgets_by_id.get(iid)
+        if budget is None:
+            messagebox.showwarning("Aviso", "Orçamento não encontrado. Recarregue a lista.")
+            return
 
-        dialog = self.create_dialog(self.budget_frame, "Editar Orçamento")
+        dialog = self._get_edit_budget_dialog()
+        entry_widgets = self._edit_budget_entries
+        # Refresh the client names; unchanged lists are not reassigned
+        client_ids = self.populate_client_names(entry_widgets["client_name"])
+        if client_ids is None:
+            return
 
-        # Create entry fields
-        entries = {
-            "Nome:": item['values'][1],
-            "Email:": item['values'][2],
-            "Tipo:": item['values'][4],
-            "Previsão de Conclusão:": item['values'][5],
-            "Prazo:": item['values'][6],
-            "Serviço:": item['values'][7]
-        }
+        for _, field in self.BUDGET_EDIT_FIELDS:
+            value = getattr(budget, field)
+            entry = entry_widgets[field]
+            entry.delete(0, tk.END)
+            entry.insert(0, "" if value is None else value)
+            # Clear a "danger" highlight from a previous save attempt
+            if field == "client_name":
+                entry.config(bootstyle="default")
+            else:
+                entry.config(style="Dialog.TEntry")
 
-        entry_widgets = {}
-        for label_text, value in entries.items():
-            ttk.Label(
-                dialog,
-                text=label_text,
-                font=("Helvetica", 10, "bold"),
-                foreground=self.config.TEXT_COLOR,
-                background=self.config.BACKGROUND_COLOR
-            ).pack(pady=5)
-            
-            entry = ttk.Entry(dialog)
-            entry.pack(pady=5)
-            entry.configure(background=self.config.ENTRY_BACKGROUND)
-            entry.insert(0, value)
-            entry_widgets[label_text] = entry
+        self._edit_budget_save_button.configure(
+            command=functools.partial(self._save_budget_edit, iid, budget, client_ids)
+        )
+        dialog.deiconify()
+        dialog.lift()
+        dialog.focus_set()
 
-        def save_budget():
-            name = entry_widgets["Nome:"].get()
-            email = entry_widgets["Email:"].get()
-            budget_type = entry_widgets["Tipo:"].get()
-            completion = entry_widgets["Previsão de Conclusão:"].get()
-            deadline = entry_widgets["Prazo:"].get()
-            service = entry_widgets["Serviço:"].get()
-
-            if name == "Digite o nome" or not name:
-                messagebox.showwarning("Aviso", "O campo nome é obrigatório!")
-                entry_widgets["Nome:"].config(bootstyle="danger")
-                return
+    def _get_edit_budget_dialog(self) -> tk.Toplevel:
+        """Build the edit budget dialog on first use; later opens only refill it"""
+        if self._edit_budget_dialog is not None:
+            return self._edit_budget_dialog
 
-            if email != "Digite o email" and not DataValidator.validate_email(email):
-                messagebox.showwarning("Aviso", "Email inválido!")
-                entry_widgets["Email:"].config(bootstyle="danger")
-                return
+        dialog = self.create_dialog(self.budget_frame, "Editar Orçamento")
+        # Closing hides the dialog so the next edit can reuse it
+        dialog.protocol("WM_DELETE_WINDOW", dialog.withdraw)
 
-            try:
-                with self.db_manager.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        UPDATE budgets
-                        SET name=?, email=?, type=?, completion=?, deadline=?, service=?
-                        WHERE budget_id=?
-                    """, (name, email, budget_type, completion, deadline, service, budget_id))
-                    
-                    conn.commit()
-                    self.load_budget_data()
-                    messagebox.showinfo("Sucesso", "Orçamento atualizado com sucesso!")
-                    dialog.destroy()
-            except Exception as e:
-                logging.error(f"Error updating budget: {e}")
-                messagebox.showerror("Erro", f"Erro ao atualizar orçamento: {e}")
+        entry_widgets = {}
+        for label_text, field in self.BUDGET_EDIT_FIELDS:
+            ttk.Label(dialog, text=label_text, style="Dialog.TLabel").pack(pady=5)
+
+            if field == "client_name":
+                entry = ttk.Combobox(dialog)
+            else:
+                entry = ttk.Entry(dialog, style="Dialog.TEntry")
+            entry.pack(pady=5)
+            entry_widgets[field] = entry
 
         # Button frame
         button_frame = ttk.Frame(dialog)
         button_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=10, padx=10)
 
-        ttk.Button(
+        # The command is set on each open, for the budget being edited
+        self._edit_budget_save_button = ttk.Button(
             button_frame,
             text="Salvar",
-            command=save_budget,
             bootstyle="success-outline"
-        ).pack(side=tk.RIGHT, padx=5)
+        )
+        self._edit_budget_save_button.pack(side=tk.RIGHT, padx=5)
 
         ttk.Button(
             button_frame,
             text="Cancelar",
-            command=dialog.destroy,
+            command=dialog.withdraw,
             bootstyle="danger-outline"
         ).pack(side=tk.RIGHT, padx=5)
 
+        self._edit_budget_entries = entry_widgets
+        self._edit_budget_dialog = dialog
+        return dialog
+
+    def _save_budget_edit(self, iid, budget, client_ids):
+        entry_widgets = self._edit_budget_entries
+        client_name = entry_widgets["client_name"].get()
+        budget_type = entry_widgets["type"].get()
+        completion = entry_widgets["completion"].get()
+        deadline = entry_widgets["deadline"].get()
+        service = entry_widgets["service"].get()
+
+        if not client_name:
+            messagebox.showwarning("Aviso", "O campo Nome do Cliente é obrigatório!")
+            entry_widgets["client_name"].config(bootstyle="danger")
+            return
+
+        client_id = self._resolve_client_id(client_ids, entry_widgets["client_name"])
+        if client_id is None:
+            return
+
+        updated = budget._replace(
+            client_name=client_name,
+            type=budget_type,
+            completion=completion,
+            deadline=deadline,
+            service=service
+        )
+
+        # Nothing edited: skip the write. The entries showed NULLs as ""
+        if all(
+            getattr(updated, field) == ("" if getattr(budget, field) is None else getattr(budget, field))
+            for _, field in self.BUDGET_EDIT_FIELDS
+        ):
+            self._edit_budget_dialog.withdraw()
+            return
+
+        # Edits saved in quick succession are committed together in one
+        # transaction; the frame, which outlives the dialog, runs the timer
+        self.db_manager.queue_write(
+            self.budget_frame,
+            _SQL_UPDATE_BUDGET,
+            (client_id, budget_type, completion, deadline, service, budget.budget_id),
+            lambda: messagebox.showinfo("Sucesso", "Orçamento atualizado com sucesso!"),
+            self._on_update_budgets_error
+        )
+
+        # Shown right away; _on_update_budgets_error reloads if the write fails
+        self._update_budget_row(iid, updated)
+        self._edit_budget_dialog.withdraw()
+
     def delete_budget_record(self):
         selected_item = self.budget_tree.selection()
         if not selected_item:
             messagebox.showwarning("Aviso", "Selecione um orçamento para excluir.")
             return
 
-        item = self.budget_tree.item(selected_item)
-        budget_id = item['values'][0]
+        iid = selected_item[0]
+        budget = self._budgets_by_id.get(iid)
+        if budget is None:
+            messagebox.showwarning("Aviso", "Orçamento não encontrado. Recarregue a lista.")
+            return
+        budget_id = budget.budget_id
 
         confirm = messagebox.askyesno("Confirmação", "Tem certeza que deseja excluir este orçamento?")
         if confirm:
             try:
+                # A queued edit of this budget must not commit after the delete
+                self.db_manager.wait_for_writes()
                 with self.db_manager.get_connection() as conn:
                     cursor = conn.cursor()
-                    cursor.execute("DELETE FROM budgets WHERE budget_id=?", (budget_id,))
+                    cursor.execute(_SQL_DELETE_BUDGET, (budget_id,))
                     conn.commit()
-                self.load_budget_data()
+                self._budgets_by_id.pop(iid, None)
+                if self.budget_tree.exists(iid):
+                    self.budget_tree.delete(iid)
                 messagebox.showinfo("Sucesso", "Orçamento excluído com sucesso!")
             except Exception as e:
                 logging.error(f"Error deleting budget: {e}")
                 messagebox.showerror("Erro", f"Erro ao excluir orçamento: {e}")
 
     def load_budget_data(self):
-        """Load budget data from database into treeview"""
-        for item in self.budget_tree.get_children():
-            self.budget_tree.delete(item)
+        """Load budget data from database into treeview.
+
+        The query runs on the database worker thread and its rows arrive in
+        batches, so the treeview fills incrementally without blocking the UI.
+        """
+        # Only the newest load may fill the tree; batches from older ones are dropped
+        self._load_generation += 1
+        generation = self._load_generation
+
+        self.budget_tree.delete(*self.budget_tree.get_children())
+        self._budgets_by_id.clear()
+        self.budget_frame.configure(cursor="watch")
+        self.db_manager.submit_batches(
+            self.budget_frame,
+            _SQL_SELECT_BUDGETS,
+            (),
+            lambda rows: self._append_budget_rows(generation, rows),
+            lambda: self._finish_budget_load(generation),
+            self._on_load_budgets_error,
+            batch_size=self.INSERT_CHUNK_SIZE
+        )
 
+    def _append_budget_rows(self, generation, rows):
+        if generation != self._load_generation:
+            return
+        # Detach the scrollbar so it is not updated once per inserted row
+        self.budget_tree.configure(yscroll="")
+        stand_in_ids = self._stand_in_ids
+        show_budget = self._show_budget
         try:
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT budget_id, client_id, date, type, completion, deadline, service FROM budgets")
-                for row in cursor.fetchall():
-                    self.budget_tree.insert("", tk.END, values=row)
-        except Exception as e:
-            logging.error(f"Error loading budget data: {e}")
-            messagebox.showerror("Erro", f"Erro ao carregar dados de orçamento: {e}")
+            for budget in map(BudgetRecord._make, rows):
+                # Tk item ids are strings; rows from old databases may lack a budget_id
+                iid = str(budget.budget_id) if budget.budget_id else f"#{next(stand_in_ids)}"
+                show_budget(iid, budget)
+        finally:
+            self.budget_tree.configure(yscroll=self.budget_scrollbar.set)
+
+    def _show_budget(self, iid, budget):
+        """Insert a budget item under iid, or refresh it if the tree already has it"""
+        if iid in self._budgets_by_id:
+            self.budget_tree.item(iid, values=budget)
+        else:
+            self.budget_tree.insert("", tk.END, iid=iid, values=budget)
+        self._budgets_by_id[iid] = budget
+
+    def _on_update_budgets_error(self, e):
+        logging.error(f"Error updating budget: {e}")
+        messagebox.showerror("Erro", f"Erro ao atualizar orçamento: {e}")
+        # The tree already shows the edit; reload so it matches the database again
+        self.load_budget_data()
+
+    def _update_budget_row(self, iid, budget):
+        """Rewrite one budget item in place instead of reloading the whole tree"""
+        # A reload may have replaced the item while the save was running
+        if self.budget_tree.exists(iid):
+            self._budgets_by_id[iid] = budget
+            self.budget_tree.item(iid, values=budget)
+
+    def _finish_budget_load(self, generation):
+        if generation == self._load_generation:
+            self.budget_frame.configure(cursor="")
+
+    def _on_load_budgets_error(self, e):
+        self.budget_frame.configure(cursor="")
+        logging.error(f"Error loading budget data: {e}")
+        messagebox.showerror("Erro", f"Erro ao carregar dados de orçamento: {e}")
 
     @staticmethod
     def create_dialog(parent: tk.Tk, title: str, geometry: str = "400x450") -> tk.Toplevel:
-        """Create a standard dialog window"""
+        """Create a standard dialog window, initially withdrawn"""
         dialog = tk.Toplevel(parent)
+        # Stay hidden while the caller adds widgets; the caller deiconifies it
+        dialog.withdraw()
         dialog.title(title)
         dialog.geometry(geometry)
         dialog.configure(bg=UIConfig.BACKGROUND_COLOR)
@@ -415,23 +939,27 @@ class BudgetManager:
     @staticmethod
     def add_placeholder(entry: ttk.Entry, placeholder: str) -> None:
         """Add placeholder text to entry widget"""
+        # Bound once; cget returns the colour as a string
+        placeholder_color = str(UIConfig.PLACEHOLDER_COLOR)
+        text_color = UIConfig.TEXT_COLOR2
         entry.insert(0, placeholder)
-        entry.config(foreground=UIConfig.PLACEHOLDER_COLOR)
+        entry.config(foreground=placeholder_color)
         
         def on_focus_in(event):
-            if entry.get() == placeholder:
+            # Focus can arrive repeatedly; only act while the placeholder is shown
+            if entry.get() == placeholder and str(entry.cget("foreground")) == placeholder_color:
                 entry.delete(0, tk.END)
-                entry.config(foreground=UIConfig.TEXT_COLOR)
+                entry.config(foreground=text_color)
         
         def on_focus_out(event):
             if not entry.get():
                 entry.insert(0, placeholder)
-                entry.config(foreground=UIConfig.PLACEHOLDER_COLOR)
+                entry.config(foreground=placeholder_color)
 
         entry.bind("<FocusIn>", on_focus_in)
         entry.bind("<FocusOut>", on_focus_out)
 
     @staticmethod
-    def generate_budget_id() -> str:
-        """Generate a secure random budget ID"""
-        return f"ART-{secrets.randbelow(9000) + 1000}"
+    def generate_budget_ids(count: int) -> list:
+        """Draw count distinct budget IDs at once, for retries and batch inserts"""
+        return [f"ART-{number}" for number in random.sample(range(1000, 10000), count)]